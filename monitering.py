@@ -4,12 +4,162 @@ import socket
 import platform
 import subprocess
 import logging
-from datetime import datetime
 import yaml
 import requests
 import json
 import threading
 import time
+import selectors
+import struct
+import functools
+import queue
+import sched
+import signal
+
+# orjson is optional; it serializes reports much faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# libyaml's C loader is much faster than the pure-Python one when available
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Seconds a service status is reused before systemctl is asked again
+SERVICE_STATUS_TTL = 5
+
+# Resolved IP addresses keyed by hostname, reused for DNS_CACHE_TTL seconds
+# so repeated checks skip the resolver round-trip
+DNS_CACHE_TTL = 300
+_DNS_CACHE = {}
+
+def _resolve(host):
+    """
+    Resolve a hostname to an IP address, caching the answer
+    
+    IPv4 is preferred when the host has both; IPv6 literals and
+    IPv6-only hosts resolve to their IPv6 address.
+    
+    :param host: Hostname or IP address
+    :return: IP address as a string
+    """
+    now = time.monotonic()
+    cached = _DNS_CACHE.get(host)
+    if cached is not None and now - cached[0] < DNS_CACHE_TTL:
+        return cached[1]
+    
+    addresses = socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+    address = next(
+        (info for info in addresses if info[0] == socket.AF_INET), addresses[0]
+    )[4][0]
+    _DNS_CACHE[host] = (now, address)
+    return address
+
+def _iso_now():
+    """
+    Current UTC time as an ISO 8601 string with second precision
+    
+    :return: Timestamp such as '2024-01-31T12:00:00Z'
+    """
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+# ICMP message types used by ping_servers
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+# ICMPv6 equivalents, for servers that resolve to an IPv6 address
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+def _icmp_checksum(data):
+    """
+    Compute the RFC 1071 internet checksum of an ICMP message
+    
+    :param data: Message bytes with the checksum field zeroed
+    :return: 16-bit checksum
+    """
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def _icmp_echo_request(sequence, message_type=ICMP_ECHO_REQUEST):
+    """
+    Build an ICMP echo request packet
+    
+    :param sequence: Sequence number to embed in the request
+    :param message_type: ICMP_ECHO_REQUEST, or ICMPV6_ECHO_REQUEST for IPv6
+    :return: Packet bytes ready to send
+    """
+    identifier = os.getpid() & 0xFFFF
+    payload = b'devops-monitor'
+    header = struct.pack('!BBHHH', message_type, 0, 0, identifier, sequence & 0xFFFF)
+    # The kernel fills in ICMPv6 checksums itself; this one is only used for IPv4
+    checksum = _icmp_checksum(header + payload)
+    return struct.pack('!BBHHH', message_type, 0, checksum, identifier, sequence & 0xFFFF) + payload
+
+class _Cached:
+    """
+    Decorator memoizing a zero-argument function's result for a TTL
+    """
+    def __init__(self, ttl_s):
+        """
+        :param ttl_s: Seconds a computed value stays valid
+        """
+        self.ttl_s = ttl_s
+    
+    def __call__(self, func):
+        state = {}
+        
+        @functools.wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if 'value' not in state or now - state['timestamp'] >= self.ttl_s:
+                state['value'] = func()
+                state['timestamp'] = now
+            return state['value']
+        
+        return wrapper
+
+# System-wide psutil readings, shared by every caller within the TTL
+@_Cached(ttl_s=5)
+def _virtual_memory():
+    return psutil.virtual_memory()
+
+@_Cached(ttl_s=5)
+def _root_disk_usage():
+    return psutil.disk_usage('/')
+
+@functools.lru_cache(maxsize=8)
+def _load_config(config_path, mtime_ns):
+    """
+    Parse a YAML configuration file, cached per path and modification time
+    
+    :param config_path: Path to the configuration YAML file
+    :param mtime_ns: Modification time of the file, so edits miss the cache
+    :return: Parsed configuration
+    """
+    with open(config_path, 'r') as file:
+        return yaml.load(file, Loader=SafeLoader)
+
+@functools.lru_cache(maxsize=None)
+def _static_system_info():
+    """
+    Collect system details that never change while the process runs
+    
+    :return: Dictionary of static system details
+    """
+    return {
+        'os': platform.system(),
+        'os_release': platform.release(),
+        'hostname': socket.gethostname(),
+        'processor': platform.processor()
+    }
 
 class DevOpsMonitoringTool:
     def __init__(self, config_path='config.yaml'):
@@ -28,8 +178,7 @@ class DevOpsMonitoringTool:
         
         # Load configuration
         try:
-            with open(config_path, 'r') as file:
-                self.config = yaml.safe_load(file)
+            self.config = _load_config(config_path, os.stat(config_path).st_mtime_ns)
         except FileNotFoundError:
             self.logger.error(f"Config file not found at {config_path}")
             self.config = {}
@@ -43,8 +192,32 @@ class DevOpsMonitoringTool:
             'disk_usage': 90
         })
         
+        # Identical alerts within this many seconds are only sent once
+        self.alert_cooldown = self.config.get('alert_cooldown', 300)
+        self._alert_last_sent = {}
+        
+        # Alerts are posted by a background worker over one keep-alive session
+        self._alert_queue = queue.Queue()
+        self._session = requests.Session()
+        if self.config.get('slack_webhook'):
+            threading.Thread(target=self._deliver_alerts, daemon=True).start()
+        
+        # Seconds between collections of each metric group; slow-moving
+        # metrics such as disk usage are sampled less often than CPU
+        self.collection_intervals = {
+            'resources': 5,
+            'disk': 60,
+            'services': 30,
+            'ping': 30,
+            **self.config.get('collection_intervals', {})
+        }
+        
         # Monitoring results storage
         self.monitoring_results = {}
+        self._service_status_cache = {}
+        
+        # Prime CPU sampling so later non-blocking reads return real deltas
+        psutil.cpu_percent(interval=None)
     
     def get_system_info(self):
         """
@@ -54,12 +227,9 @@ class DevOpsMonitoringTool:
         """
         try:
             return {
-                'os': platform.system(),
-                'os_release': platform.release(),
-                'hostname': socket.gethostname(),
-                'processor': platform.processor(),
-                'total_memory': psutil.virtual_memory().total / (1024 * 1024 * 1024),
-                'total_disk': psutil.disk_usage('/').total / (1024 * 1024 * 1024)
+                **_static_system_info(),
+                'total_memory': _virtual_memory().total / (1024 * 1024 * 1024),
+                'total_disk': _root_disk_usage().total / (1024 * 1024 * 1024)
             }
         except Exception as e:
             self.logger.error(f"Error collecting system info: {e}")
@@ -72,41 +242,66 @@ class DevOpsMonitoringTool:
         :param service_name: Name of the service to check
         :return: Boolean indicating service status
         """
-        try:
-            # Works for systemd-based systems (Linux)
-            result = subprocess.run(
-                ['systemctl', 'is-active', service_name], 
-                capture_output=True, 
-                text=True
-            )
-            return result.stdout.strip() == 'active'
-        except Exception as e:
-            self.logger.error(f"Error checking service {service_name}: {e}")
-            return False
+        return self.check_services_status([service_name])[service_name]
     
-    def monitor_resources(self):
+    def check_services_status(self, service_names):
+        """
+        Check the status of several services with a single systemctl call
+        
+        Statuses are remembered for SERVICE_STATUS_TTL seconds, so repeated
+        checks within one monitoring tick only query services not yet seen.
+        
+        :param service_names: Names of the services to check
+        :return: Dictionary mapping each service name to a boolean status
+        """
+        now = time.monotonic()
+        statuses = {}
+        stale_names = []
+        for service_name in service_names:
+            cached = self._service_status_cache.get(service_name)
+            if cached is not None and now - cached[0] < SERVICE_STATUS_TTL:
+                statuses[service_name] = cached[1]
+            else:
+                stale_names.append(service_name)
+        
+        if stale_names:
+            try:
+                # Works for systemd-based systems (Linux); systemctl prints
+                # one status line per unit, in argument order
+                result = subprocess.run(
+                    ['systemctl', 'is-active', *stale_names], 
+                    capture_output=True, 
+                    text=True
+                )
+                for service_name, status in zip(stale_names, result.stdout.splitlines()):
+                    statuses[service_name] = status.strip() == 'active'
+                    self._service_status_cache[service_name] = (now, statuses[service_name])
+            except Exception as e:
+                self.logger.error(f"Error checking services {', '.join(stale_names)}: {e}")
+        
+        return {service_name: statuses.get(service_name, False) for service_name in service_names}
+    
+    def monitor_resources(self, include_disk=True):
         """
         Monitor system resources and log alerts
+        
+        :param include_disk: Also refresh disk usage (see monitor_disk)
         """
         try:
-            # CPU Usage
-            cpu_usage = psutil.cpu_percent(interval=1)
+            # CPU Usage; non-blocking, so the reading covers the time since
+            # the previous tick rather than stalling the loop to sample
+            cpu_usage = psutil.cpu_percent(interval=None)
             
             # Memory Usage
-            memory = psutil.virtual_memory()
+            memory = _virtual_memory()
             memory_usage = memory.percent
             
-            # Disk Usage
-            disk = psutil.disk_usage('/')
-            disk_usage = disk.percent
-            
             # Store results
-            self.monitoring_results = {
-                'timestamp': datetime.now().isoformat(),
+            self.monitoring_results.update({
+                'timestamp': _iso_now(),
                 'cpu_usage': cpu_usage,
-                'memory_usage': memory_usage,
-                'disk_usage': disk_usage
-            }
+                'memory_usage': memory_usage
+            })
             
             # Check and log alerts
             if cpu_usage > self.alert_threshold['cpu_usage']:
@@ -114,29 +309,128 @@ class DevOpsMonitoringTool:
             
             if memory_usage > self.alert_threshold['memory_usage']:
                 self.logger.warning(f"HIGH MEMORY USAGE: {memory_usage}%")
+        
+        except Exception as e:
+            self.logger.error(f"Resource monitoring error: {e}")
+        
+        if include_disk:
+            self.monitor_disk()
+    
+    def monitor_disk(self):
+        """
+        Monitor root disk usage and log alerts
+        """
+        try:
+            disk_usage = _root_disk_usage().percent
+            self.monitoring_results['disk_usage'] = disk_usage
             
             if disk_usage > self.alert_threshold['disk_usage']:
                 self.logger.warning(f"HIGH DISK USAGE: {disk_usage}%")
         
         except Exception as e:
-            self.logger.error(f"Resource monitoring error: {e}")
+            self.logger.error(f"Disk monitoring error: {e}")
+    
+    def monitor_services(self):
+        """
+        Check monitored services and alert on any that are down
+        """
+        service_statuses = self.check_services_status(self.monitored_services)
+        for service, is_active in service_statuses.items():
+            if not is_active:
+                alert_msg = f"ALERT: Service {service} is DOWN"
+                self.logger.critical(alert_msg)
+                self.send_alert(alert_msg)
+    
+    def monitor_servers(self):
+        """
+        Ping monitored servers and record their reachability
+        """
+        self.monitoring_results['server_status'] = self.ping_servers()
     
-    def ping_servers(self):
+    def _send_echo_request(self, server, sequence):
+        """
+        Send a single ICMP echo request without waiting for the reply
+        
+        :param server: IPv4 or IPv6 address to ping
+        :param sequence: ICMP sequence number for the request
+        :return: Tuple of (non-blocking socket the reply will arrive on,
+                 ICMP type of the expected echo reply)
+        """
+        if ':' in server:
+            sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM, socket.IPPROTO_ICMPV6)
+            request_type, reply_type = ICMPV6_ECHO_REQUEST, ICMPV6_ECHO_REPLY
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            request_type, reply_type = ICMP_ECHO_REQUEST, ICMP_ECHO_REPLY
+        try:
+            sock.setblocking(False)
+            sock.sendto(_icmp_echo_request(sequence, request_type), (server, 0))
+            return sock, reply_type
+        except Exception:
+            sock.close()
+            raise
+    
+    def ping_servers(self, timeout=1):
         """
         Ping monitored servers and check connectivity
+        
+        One echo request is sent to every server up front and the replies
+        are awaited together, so a check costs about one timeout in total
+        rather than one per server.
+        
+        :param timeout: Seconds to wait for replies
+        :return: Dictionary mapping each server to its reachability
         """
-        server_status = {}
-        for server in self.monitored_servers:
-            try:
-                response = subprocess.run(
-                    ['ping', '-c', '4', server], 
-                    capture_output=True, 
-                    text=True
-                )
-                server_status[server] = response.returncode == 0
-            except Exception as e:
-                server_status[server] = False
-                self.logger.error(f"Error pinging {server}: {e}")
+        server_status = {server: False for server in self.monitored_servers}
+        fallback_pings = {}
+        selector = selectors.DefaultSelector()
+        
+        try:
+            for sequence, server in enumerate(self.monitored_servers):
+                try:
+                    address = _resolve(server)
+                    try:
+                        sock, reply_type = self._send_echo_request(address, sequence)
+                    except PermissionError:
+                        # Unprivileged ICMP sockets are disabled on this host
+                        # (net.ipv4.ping_group_range), so use the ping binary,
+                        # still launching every probe before waiting on any
+                        fallback_pings[server] = subprocess.Popen(
+                            ['ping', '-c', '1', '-W', str(max(1, int(timeout))), address],
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL
+                        )
+                    else:
+                        selector.register(sock, selectors.EVENT_READ, (server, reply_type))
+                except Exception as e:
+                    self.logger.error(f"Error pinging {server}: {e}")
+            
+            deadline = time.monotonic() + timeout
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    server, reply_type = key.data
+                    try:
+                        reply = key.fileobj.recv(1024)
+                        server_status[server] = bool(reply) and reply[0] == reply_type
+                    except OSError as e:
+                        self.logger.error(f"Error pinging {server}: {e}")
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+            
+            for server, process in fallback_pings.items():
+                try:
+                    remaining = max(0, deadline - time.monotonic()) + 1
+                    server_status[server] = process.wait(timeout=remaining) == 0
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
         
         return server_status
     
@@ -144,34 +438,81 @@ class DevOpsMonitoringTool:
         """
         Send alerts via multiple channels (Slack, Email, etc.)
         
+        Alerts are queued for the background delivery worker, so this never
+        blocks on the network. Repeats of the same alert within the cooldown
+        window are dropped to avoid alert storms.
+        
         :param message: Alert message to send
         """
         # Slack webhook alert (configure in config)
+        if not self.config.get('slack_webhook'):
+            return
+        
+        now = time.monotonic()
+        last_sent = self._alert_last_sent.get(message)
+        if last_sent is not None and now - last_sent < self.alert_cooldown:
+            return
+        
+        # Forget alerts whose cooldown has lapsed so the history stays small
+        self._alert_last_sent = {
+            sent_message: sent_at
+            for sent_message, sent_at in self._alert_last_sent.items()
+            if now - sent_at < self.alert_cooldown
+        }
+        self._alert_last_sent[message] = now
+        self._alert_queue.put_nowait(message)
+    
+    def _deliver_alerts(self):
+        """
+        Post queued alerts to Slack, reusing one HTTP connection
+        """
         slack_webhook = self.config.get('slack_webhook')
-        if slack_webhook:
+        while True:
+            message = self._alert_queue.get()
             try:
-                requests.post(slack_webhook, json={'text': message})
+                self._session.post(slack_webhook, json={'text': message}, timeout=5)
             except Exception as e:
                 self.logger.error(f"Slack alert failed: {e}")
+            finally:
+                self._alert_queue.task_done()
     
-    def continuous_monitoring(self, interval=60):
+    def continuous_monitoring(self, interval=None, stop_event=None):
         """
         Continuously monitor system resources
         
-        :param interval: Monitoring interval in seconds
+        Each metric group is collected on its own schedule, as configured in
+        collection_intervals, so fast-changing metrics are sampled often
+        without repeating slow or expensive checks on every pass.
+        
+        :param interval: Single interval in seconds overriding the per-metric intervals
+        :param stop_event: threading.Event that ends monitoring once set
         """
-        while True:
-            self.monitor_resources()
-            server_status = self.ping_servers()
-            
-            # Check service statuses
-            for service in self.monitored_services:
-                if not self.check_service_status(service):
-                    alert_msg = f"ALERT: Service {service} is DOWN"
-                    self.logger.critical(alert_msg)
-                    self.send_alert(alert_msg)
-            
-            time.sleep(interval)
+        if stop_event is None:
+            stop_event = threading.Event()
+        
+        intervals = dict(self.collection_intervals)
+        if interval is not None:
+            intervals = dict.fromkeys(intervals, interval)
+        
+        collectors = {
+            'resources': lambda: self.monitor_resources(include_disk=False),
+            'disk': self.monitor_disk,
+            'services': self.monitor_services,
+            'ping': self.monitor_servers
+        }
+        scheduler = sched.scheduler(time.monotonic, stop_event.wait)
+        
+        def run_collector(name):
+            # Re-arm before running so a slow collector keeps its cadence
+            scheduler.enter(intervals[name], 0, run_collector, (name,))
+            collectors[name]()
+        
+        for name in collectors:
+            scheduler.enter(0, 0, run_collector, (name,))
+        
+        # Sleep until the next collector is due, waking early on shutdown
+        while not stop_event.wait(scheduler.run(blocking=False)):
+            pass
     
     def generate_report(self):
         """
@@ -185,14 +526,19 @@ class DevOpsMonitoringTool:
             'current_monitoring_results': self.monitoring_results
         }
         
+        if orjson is not None:
+            return orjson.dumps(monitoring_data, option=orjson.OPT_INDENT_2).decode()
         return json.dumps(monitoring_data, indent=2)
     
-    def start_monitoring(self):
+    def start_monitoring(self, stop_event=None):
         """
         Start continuous monitoring in a separate thread
+        
+        :param stop_event: threading.Event that ends monitoring once set
         """
         monitoring_thread = threading.Thread(
             target=self.continuous_monitoring, 
+            kwargs={'stop_event': stop_event},
             daemon=True
         )
         monitoring_thread.start()
@@ -201,18 +547,20 @@ def main():
     # Example usage
     monitor = DevOpsMonitoringTool('config.yaml')
     
+    # Stop cleanly on Ctrl-C or a termination request
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    
     # Start monitoring
-    monitor.start_monitoring()
+    monitor.start_monitoring(stop_event)
     
     # Generate initial report
     print(monitor.generate_report())
     
-    # Keep the main thread running
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("Monitoring stopped.")
+    # Keep the main thread idle until asked to stop
+    stop_event.wait()
+    print("Monitoring stopped.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
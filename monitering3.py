@@ -1,10 +1,221 @@
 import paramiko
+import atexit
 import csv
 import json
 import logging
-from datetime import datetime
+from logging.handlers import RotatingFileHandler
 import concurrent.futures
 import os
+import queue
+import select
+import socket
+import threading
+import time
+
+# orjson is optional; it serializes reports much faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow is optional; with it, batch results go to one Parquet dataset
+# instead of a JSON file per server and run
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# numpy is optional; with it, fleet threshold checks run as one vectorized pass
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Resolved IP addresses keyed by hostname, reused for DNS_CACHE_TTL seconds
+# so repeated checks skip the resolver round-trip
+DNS_CACHE_TTL = 300
+_DNS_CACHE = {}
+
+def _resolve(host):
+    """
+    Resolve a hostname to an IP address, caching the answer.
+    
+    IPv4 is preferred when the host has both; IPv6 literals and
+    IPv6-only hosts resolve to their IPv6 address.
+    
+    :param host: Hostname or IP address
+    :return: IP address as a string
+    """
+    now = time.monotonic()
+    cached = _DNS_CACHE.get(host)
+    if cached is not None and now - cached[0] < DNS_CACHE_TTL:
+        return cached[1]
+    
+    addresses = socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+    address = next(
+        (info for info in addresses if info[0] == socket.AF_INET), addresses[0]
+    )[4][0]
+    _DNS_CACHE[host] = (now, address)
+    return address
+
+# Guards one-time configuration of the shared health check logger
+_LOGGER_LOCK = threading.Lock()
+
+def _get_base_logger():
+    """
+    Get the logger shared by every health checker, configuring it once.
+    
+    Records carry the checked host in a 'host' field, supplied by the
+    LoggerAdapter each checker wraps around this logger.
+    
+    :return: Logger writing to the rotating logs/health.log file
+    """
+    logger = logging.getLogger('health_check')
+    with _LOGGER_LOCK:
+        if not logger.handlers:
+            os.makedirs('logs', exist_ok=True)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(host)s] %(message)s')
+            file_handler = RotatingFileHandler(
+                'logs/health.log', maxBytes=50_000_000, backupCount=5
+            )
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+            
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            logger.addHandler(console_handler)
+    
+    return logger
+
+# Delimiter echoed between batched remote commands
+SECTION_SEPARATOR = '__SEP__'
+
+# Idle SSH connections keyed by (hostname, username, port, key_filename),
+# reused across health checks to avoid a fresh handshake every time
+_SSH_POOL = {}
+_SSH_POOL_LOCK = threading.Lock()
+
+# Connections currently lent out by the pool, mapped to their pool key and
+# the pool generation they were lent from; closing the pool starts a new
+# generation so connections returned afterwards are closed, not pooled
+_SSH_CHECKED_OUT = {}
+_SSH_POOL_GENERATION = 0
+
+# Pooled connections idle for longer than this (seconds) are closed, not reused
+SSH_POOL_IDLE_TIMEOUT = 300
+
+# Seconds a remote command may stay silent before it is abandoned
+COMMAND_TIMEOUT = 30
+
+# Maximum bytes pulled from an SSH channel per read
+CHANNEL_READ_SIZE = 65536
+
+# Seconds allowed for the TCP connect, SSH banner and authentication each,
+# so an unresponsive host fails fast instead of holding a worker
+CONNECT_TIMEOUT = 5
+
+# Usage percentages above which a server is flagged after a batch
+ALERT_THRESHOLDS = {
+    'cpu': 80,
+    'memory': 85,
+    'disk': 90
+}
+
+# Write buffer for report files, so a report reaches disk in few syscalls
+REPORT_BUFFER_SIZE = 64 << 10
+
+# Seconds a whole batch of health checks may take before stragglers are abandoned
+CHECK_BUDGET_S = 120
+
+# Shared by every batch; worker threads are only started as checks are submitted
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix='health_check')
+
+def _iso_now():
+    """
+    Current UTC time as an ISO 8601 string with second precision.
+    
+    :return: Timestamp such as '2024-01-31T12:00:00Z'
+    """
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+def _parse_meminfo(text):
+    """
+    Parse /proc/meminfo into memory usage figures.
+    
+    :param text: Contents of /proc/meminfo
+    :return: Dictionary with total/available kB and percent used
+    """
+    fields = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(':')
+        if value.split():
+            fields[name] = int(value.split()[0])
+    
+    total = fields['MemTotal']
+    available = fields.get('MemAvailable', fields['MemFree'])
+    return {
+        'total_kb': total,
+        'available_kb': available,
+        'percent': round((1 - available / total) * 100, 2)
+    }
+
+def _parse_loadavg(text):
+    """
+    Parse /proc/loadavg into load averages.
+    
+    :param text: Contents of /proc/loadavg
+    :return: Dictionary of 1, 5 and 15 minute load averages
+    """
+    load_1, load_5, load_15 = (float(value) for value in text.split()[:3])
+    return {'1_min': load_1, '5_min': load_5, '15_min': load_15}
+
+def _parse_cpu_percent(text):
+    """
+    Compute CPU utilisation from two aggregate 'cpu' lines of /proc/stat.
+    
+    :param text: Two /proc/stat 'cpu' lines sampled a short interval apart
+    :return: Percentage of CPU time spent busy between the two samples
+    """
+    first, second = (
+        [int(ticks) for ticks in line.split()[1:9]]
+        for line in text.splitlines()[:2]
+    )
+    # idle + iowait
+    idle_delta = (second[3] + second[4]) - (first[3] + first[4])
+    total_delta = sum(second) - sum(first)
+    if total_delta <= 0:
+        return 0.0
+    return round((1 - idle_delta / total_delta) * 100, 2)
+
+def _parse_df(text):
+    """
+    Parse 'df -Pk' output into per-filesystem usage.
+    
+    :param text: Output of 'df -Pk'
+    :return: List of dictionaries describing each filesystem
+    """
+    disks = []
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 6:
+            continue
+        try:
+            disks.append({
+                'filesystem': fields[0],
+                'mountpoint': ' '.join(fields[5:]),
+                'total_kb': int(fields[1]),
+                'used_kb': int(fields[2]),
+                'available_kb': int(fields[3]),
+                'percent': float(fields[4].rstrip('%'))
+            })
+        except ValueError:
+            # Pseudo filesystems report '-' instead of sizes
+            continue
+    return disks
 
 class RemoteServerHealthChecker:
     def __init__(self, hostname, username, password=None, key_filename=None, port=22):
@@ -28,30 +239,11 @@ class RemoteServerHealthChecker:
 
     def _setup_logger(self):
         """
-        Set up logging for each server.
+        Set up logging for this server.
         
-        :return: Configured logger
+        :return: Logger adapter tagging records with the hostname
         """
-        # Ensure logs directory exists
-        os.makedirs('logs', exist_ok=True)
-        
-        logger = logging.getLogger(f'health_check_{self.hostname}')
-        logger.setLevel(logging.INFO)
-        
-        # File handler
-        file_handler = logging.FileHandler(
-            f'logs/server_health_check_{self.hostname}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
-        )
-        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-        
-        return logger
+        return logging.LoggerAdapter(_get_base_logger(), {'host': self.hostname})
 
     def connect(self):
         """
@@ -66,17 +258,27 @@ class RemoteServerHealthChecker:
             # Attempt connection with either password or key
             if self.key_filename:
                 client.connect(
-                    hostname=self.hostname, 
+                    hostname=_resolve(self.hostname), 
                     username=self.username, 
                     key_filename=self.key_filename, 
-                    port=self.port
+                    port=self.port,
+                    allow_agent=False,
+                    look_for_keys=False,
+                    timeout=CONNECT_TIMEOUT,
+                    banner_timeout=CONNECT_TIMEOUT,
+                    auth_timeout=CONNECT_TIMEOUT
                 )
             else:
                 client.connect(
-                    hostname=self.hostname, 
+                    hostname=_resolve(self.hostname), 
                     username=self.username, 
                     password=self.password, 
-                    port=self.port
+                    port=self.port,
+                    allow_agent=False,
+                    look_for_keys=False,
+                    timeout=CONNECT_TIMEOUT,
+                    banner_timeout=CONNECT_TIMEOUT,
+                    auth_timeout=CONNECT_TIMEOUT
                 )
             
             self.logger.info(f"Successfully connected to {self.hostname}")
@@ -85,6 +287,69 @@ class RemoteServerHealthChecker:
             self.logger.error(f"Connection failed: {e}")
             raise
 
+    def _idle_connections(self):
+        """
+        Get the pool queue holding idle connections for this server.
+        
+        :return: Queue of (client, last_used) tuples
+        """
+        key = (self.hostname, self.username, self.port, self.key_filename)
+        with _SSH_POOL_LOCK:
+            return _SSH_POOL.setdefault(key, queue.Queue())
+
+    def acquire_client(self):
+        """
+        Get a live SSH connection from the pool, connecting if none is idle.
+        
+        :return: paramiko SSHClient instance
+        """
+        idle = self._idle_connections()
+        while True:
+            try:
+                client, last_used = idle.get_nowait()
+            except queue.Empty:
+                client = self.connect()
+                break
+
+            transport = client.get_transport()
+            if (time.monotonic() - last_used < SSH_POOL_IDLE_TIMEOUT
+                    and transport is not None and transport.is_active()):
+                break
+
+            # Reap connections that went stale while idle
+            client.close()
+        
+        with _SSH_POOL_LOCK:
+            _SSH_CHECKED_OUT[client] = (
+                (self.hostname, self.username, self.port, self.key_filename),
+                _SSH_POOL_GENERATION
+            )
+        return client
+
+    def release_client(self, client):
+        """
+        Return an SSH connection to the pool, dropping it if it is no longer alive.
+        
+        :param client: SSH client obtained from acquire_client
+        """
+        with _SSH_POOL_LOCK:
+            _, generation = _SSH_CHECKED_OUT.pop(client, (None, None))
+            pool_closed = generation != _SSH_POOL_GENERATION
+        if pool_closed:
+            # The pool was closed while this connection was out
+            client.close()
+            return
+        
+        # Checked locally; paramiko's SSH_MSG_IGNORE probe is malformed and
+        # makes strict servers drop the connection it was meant to test
+        transport = client.get_transport()
+        if transport is None or not transport.is_active():
+            self.logger.warning(f"Dropping dead connection to {self.hostname}")
+            client.close()
+            return
+
+        self._idle_connections().put((client, time.monotonic()))
+
     def run_remote_command(self, client, command):
         """
         Run a command on the remote server.
@@ -94,9 +359,31 @@ class RemoteServerHealthChecker:
         :return: Command output
         """
         try:
-            stdin, stdout, stderr = client.exec_command(command)
-            output = stdout.read().decode('utf-8').strip()
-            error = stderr.read().decode('utf-8').strip()
+            channel = client.get_transport().open_session()
+            try:
+                channel.exec_command(command)
+                channel.shutdown_write()
+                
+                # Drain stdout and stderr as data arrives so a chatty stream
+                # can never fill its window and stall the other
+                stdout = bytearray()
+                stderr = bytearray()
+                while True:
+                    readable, _, _ = select.select([channel], [], [], COMMAND_TIMEOUT)
+                    if not readable:
+                        raise TimeoutError(f"no output received for {COMMAND_TIMEOUT}s")
+                    if channel.recv_ready():
+                        stdout += channel.recv(CHANNEL_READ_SIZE)
+                    if channel.recv_stderr_ready():
+                        stderr += channel.recv_stderr(CHANNEL_READ_SIZE)
+                    if ((channel.exit_status_ready() or channel.closed)
+                            and not channel.recv_ready() and not channel.recv_stderr_ready()):
+                        break
+            finally:
+                channel.close()
+            
+            output = stdout.decode('utf-8').strip()
+            error = stderr.decode('utf-8').strip()
             
             if error:
                 self.logger.warning(f"Command error: {error}")
@@ -114,7 +401,7 @@ class RemoteServerHealthChecker:
         """
         client = None
         health_report = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _iso_now(),
             'hostname': self.hostname,
             'system': {},
             'resources': {},
@@ -123,40 +410,64 @@ class RemoteServerHealthChecker:
         }
 
         try:
-            # Establish SSH connection
-            client = self.connect()
-
-            # Collect system information
-            health_report['system']['os'] = self.run_remote_command(client, 'uname -a')
-            health_report['system']['uptime'] = self.run_remote_command(client, 'uptime')
-            health_report['system']['kernel'] = self.run_remote_command(client, 'uname -r')
-
-            # Check disk usage
-            disk_usage = self.run_remote_command(client, 'df -h')
-            health_report['resources']['disk'] = disk_usage.split('\n')
-
-            # Check memory usage
-            memory_usage = self.run_remote_command(client, 'free -h')
-            health_report['resources']['memory'] = memory_usage.split('\n')
+            # Reuse a pooled SSH connection when one is available
+            client = self.acquire_client()
 
-            # Check CPU usage
-            cpu_usage = self.run_remote_command(client, 'top -bn1 | grep "Cpu(s)"')
-            health_report['resources']['cpu'] = cpu_usage
+            # Collect everything in a single round-trip; each probe's output
+            # is delimited so it can be split back into sections locally
+            services_to_check = ['ssh', 'nginx', 'apache2', 'mysql', 'postgresql', 'docker']
+            commands = [
+                'uname -a',
+                'uptime',
+                'uname -r',
+                'df -Pk',
+                'cat /proc/meminfo',
+                'cat /proc/loadavg',
+                # Two CPU counter samples; utilisation is the delta between them
+                'head -n1 /proc/stat ; sleep 0.2 ; head -n1 /proc/stat',
+                'ps aux | head -n 10',
+                f'systemctl is-active {" ".join(services_to_check)}',
+                'ip addr',
+                'ip route'
+            ]
+            output = self.run_remote_command(client, f' ; echo {SECTION_SEPARATOR} ; '.join(commands))
+            if output is None:
+                raise RuntimeError("Batched health check command failed or timed out")
+            sections = [section.strip() for section in output.split(f'{SECTION_SEPARATOR}\n')]
+            if len(sections) != len(commands):
+                raise RuntimeError(
+                    f"Unexpected batched command output: {len(sections)} sections, expected {len(commands)}"
+                )
+            (os_info, uptime, kernel, disk_usage, meminfo, loadavg, cpu_stat,
+             processes, service_statuses, interfaces, routes) = sections
 
-            # Check running processes
-            processes = self.run_remote_command(client, 'ps aux | head -n 10')
+            # System information
+            health_report['system']['os'] = os_info
+            health_report['system']['uptime'] = uptime
+            health_report['system']['kernel'] = kernel
             health_report['system']['top_processes'] = processes.split('\n')
 
-            # Check critical services (customize as needed)
-            services_to_check = ['ssh', 'nginx', 'apache2', 'mysql', 'postgresql', 'docker']
-            health_report['services'] = {}
-            for service in services_to_check:
-                service_status = self.run_remote_command(client, f'systemctl is-active {service}')
-                health_report['services'][service] = service_status
+            # Resource usage, parsed into numbers ready for threshold checks
+            health_report['resources']['disk'] = _parse_df(disk_usage)
+            health_report['resources']['memory'] = _parse_meminfo(meminfo)
+            health_report['resources']['cpu'] = _parse_cpu_percent(cpu_stat)
+            health_report['resources']['load_average'] = _parse_loadavg(loadavg)
+
+            # Critical services (customize as needed); systemctl prints one
+            # status line per unit in the order they were given
+            statuses = service_statuses.split('\n') if service_statuses else []
+            if len(statuses) != len(services_to_check):
+                # systemctl failed outright (no systemd, bus error); keep a
+                # key per service rather than silently dropping them
+                self.logger.error(
+                    f"systemctl returned {len(statuses)} statuses for {len(services_to_check)} services"
+                )
+                statuses += ['unknown'] * (len(services_to_check) - len(statuses))
+            health_report['services'] = dict(zip(services_to_check, statuses))
 
             # Network connectivity check
-            health_report['network']['interfaces'] = self.run_remote_command(client, 'ip addr')
-            health_report['network']['routes'] = self.run_remote_command(client, 'ip route')
+            health_report['network']['interfaces'] = interfaces
+            health_report['network']['routes'] = routes
 
             # Log successful health check
             self.logger.info(f"Health check completed for {self.hostname}")
@@ -169,25 +480,72 @@ class RemoteServerHealthChecker:
             return health_report
         finally:
             if client:
-                client.close()
+                self.release_client(client)
 
-    def save_report(self, report):
+    def save_report(self, report, pretty=False):
         """
         Save health check report to a JSON file.
         
         :param report: Health check report dictionary
+        :param pretty: Indent the JSON for reading by eye instead of writing it compactly
         """
         try:
             # Ensure reports directory exists
             os.makedirs('reports', exist_ok=True)
             
-            filename = f'reports/health_report_{self.hostname}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            with open(filename, 'w') as f:
-                json.dump(report, f, indent=4)
+            filename = f'reports/health_report_{self.hostname}_{time.strftime("%Y%m%d_%H%M%S", time.gmtime())}.json'
+            if orjson is not None:
+                with open(filename, 'wb', buffering=REPORT_BUFFER_SIZE) as f:
+                    f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 if pretty else 0))
+            else:
+                with open(filename, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+                    if pretty:
+                        json.dump(report, f, indent=4)
+                    else:
+                        json.dump(report, f, separators=(',', ':'))
             self.logger.info(f"Report saved to {filename}")
         except Exception as e:
             self.logger.error(f"Failed to save report: {e}")
 
+def close_active_connections(hostname, username):
+    """
+    Close the SSH connections currently lent out for a host and user.
+    
+    A health check blocked on one of them fails straight away instead of
+    holding its worker until the command timeout.
+    
+    :param hostname: Host whose in-flight checks should be abandoned
+    :param username: SSH username the checks connected as
+    """
+    with _SSH_POOL_LOCK:
+        clients = [
+            client for client, (key, _) in _SSH_CHECKED_OUT.items()
+            if key[:2] == (hostname, username)
+        ]
+    for client in clients:
+        client.close()
+
+def close_pooled_connections():
+    """
+    Close every idle SSH connection held in the pool.
+    
+    Connections lent out at the time are closed when they are returned.
+    """
+    global _SSH_POOL_GENERATION
+    with _SSH_POOL_LOCK:
+        idle_queues = list(_SSH_POOL.values())
+        _SSH_POOL.clear()
+        _SSH_POOL_GENERATION += 1
+
+    for idle in idle_queues:
+        while not idle.empty():
+            client, _ = idle.get_nowait()
+            client.close()
+
+# The pool outlives any one main() run so repeated runs in a process reuse
+# connections; it is only torn down when the interpreter exits
+atexit.register(close_pooled_connections)
+
 def process_server(server_details):
     """
     Process health check for a single server.
@@ -206,14 +564,123 @@ def process_server(server_details):
         # Perform health check
         health_report = checker.check_server_health()
         
-        # Save report
-        checker.save_report(health_report)
+        # Save report; with pyarrow, main() writes the whole batch at once
+        if pq is None:
+            checker.save_report(health_report)
         
         return health_report
     except Exception as e:
         print(f"Error processing server {server_details['ip']}: {e}")
         return None
 
+def flatten_report(report):
+    """
+    Flatten a health report into one row of scalar columns.
+    
+    :param report: Health report dictionary
+    :return: Dictionary of column name to scalar value
+    """
+    system = report.get('system', {})
+    resources = report.get('resources', {})
+    network = report.get('network', {})
+    load_average = resources.get('load_average', {})
+    root_disk = next(
+        (disk for disk in resources.get('disk', []) if disk['mountpoint'] == '/'), {}
+    )
+    
+    row = {
+        'date': report['timestamp'][:10],
+        'hostname': report['hostname'],
+        'timestamp': report['timestamp'],
+        'error': report.get('error'),
+        'cpu_percent': resources.get('cpu'),
+        'memory_percent': resources.get('memory', {}).get('percent'),
+        'disk_percent': root_disk.get('percent'),
+        'load_1_min': load_average.get('1_min'),
+        'load_5_min': load_average.get('5_min'),
+        'load_15_min': load_average.get('15_min')
+    }
+    for service, status in report.get('services', {}).items():
+        row[f'service_{service}'] = status
+    
+    # Raw command output kept as text columns, out of the way of the metrics
+    row['os'] = system.get('os')
+    row['kernel'] = system.get('kernel')
+    row['uptime'] = system.get('uptime')
+    row['top_processes'] = '\n'.join(system.get('top_processes', []))
+    row['network_interfaces'] = network.get('interfaces')
+    row['network_routes'] = network.get('routes')
+    return row
+
+def _report_schema(rows):
+    """
+    Build the Arrow schema for flattened report rows.
+    
+    Column types are fixed so every batch writes matching files, and the
+    service columns are the union over all rows, whichever row comes first.
+    
+    :param rows: Rows produced by flatten_report
+    :return: pyarrow schema covering every column in the batch
+    """
+    services = sorted({column for row in rows for column in row if column.startswith('service_')})
+    return pa.schema(
+        [(column, pa.string()) for column in ('date', 'hostname', 'timestamp', 'error')]
+        + [(column, pa.float64()) for column in (
+            'cpu_percent', 'memory_percent', 'disk_percent',
+            'load_1_min', 'load_5_min', 'load_15_min'
+        )]
+        + [(column, pa.string()) for column in services]
+        + [(column, pa.string()) for column in (
+            'os', 'kernel', 'uptime', 'top_processes',
+            'network_interfaces', 'network_routes'
+        )]
+    )
+
+def save_reports_parquet(reports, root_path='reports'):
+    """
+    Append a batch of health reports to a Parquet dataset partitioned by date and host.
+    
+    :param reports: Health report dictionaries
+    :param root_path: Root directory of the dataset
+    """
+    try:
+        rows = [flatten_report(report) for report in reports]
+        table = pa.Table.from_pylist(rows, schema=_report_schema(rows))
+        pq.write_to_dataset(table, root_path=root_path, partition_cols=['date', 'hostname'])
+        print(f"{len(reports)} reports saved to {root_path}")
+    except Exception as e:
+        print(f"Failed to save reports: {e}")
+
+def find_threshold_violations(reports, thresholds=ALERT_THRESHOLDS):
+    """
+    Find servers whose CPU, memory or root disk usage exceeds a threshold.
+    
+    :param reports: Health report dictionaries
+    :param thresholds: Percentage limits keyed by 'cpu', 'memory' and 'disk'
+    :return: Hostnames of servers over any threshold
+    """
+    rows = [flatten_report(report) for report in reports]
+    columns = ('cpu_percent', 'memory_percent', 'disk_percent')
+    limits = (thresholds['cpu'], thresholds['memory'], thresholds['disk'])
+    
+    if np is not None:
+        # One column per metric; missing readings become NaN, which never compares greater
+        samples = np.array(
+            [tuple(np.nan if row[column] is None else row[column] for column in columns) for row in rows],
+            dtype=[('cpu', 'f4'), ('memory', 'f4'), ('disk', 'f4')]
+        )
+        over = (
+            (samples['cpu'] > limits[0])
+            | (samples['memory'] > limits[1])
+            | (samples['disk'] > limits[2])
+        )
+        return [rows[index]['hostname'] for index in np.flatnonzero(over)]
+    
+    return [
+        row['hostname'] for row in rows
+        if any(row[column] is not None and row[column] > limit for column, limit in zip(columns, limits))
+    ]
+
 def read_servers_from_csv(filename):
     """
     Read server details from a CSV file.
@@ -245,24 +712,49 @@ def main():
         return
     
     # Use concurrent processing to check multiple servers simultaneously
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        # Submit health checks for all servers
-        future_to_server = {
-            executor.submit(process_server, server): server 
-            for server in servers
-        }
-        
-        # Collect results
-        for future in concurrent.futures.as_completed(future_to_server):
-            server = future_to_server[future]
-            try:
-                result = future.result()
-                if result:
-                    print(f"Health check completed for {server['ip']}")
-                else:
-                    print(f"Health check failed for {server['ip']}")
-            except Exception as e:
-                print(f"Error processing {server['ip']}: {e}")
+    future_to_server = {
+        _EXECUTOR.submit(process_server, server): server 
+        for server in servers
+    }
+    
+    # Collect results, giving up on any server still running once the budget is spent
+    reports = []
+    
+    def record(future, server):
+        try:
+            result = future.result()
+            if result:
+                reports.append(result)
+                print(f"Health check completed for {server['ip']}")
+            else:
+                print(f"Health check failed for {server['ip']}")
+        except Exception as e:
+            print(f"Error processing {server['ip']}: {e}")
+    
+    recorded = set()
+    try:
+        for future in concurrent.futures.as_completed(future_to_server, timeout=CHECK_BUDGET_S):
+            recorded.add(future)
+            record(future, future_to_server[future])
+    except concurrent.futures.TimeoutError:
+        for future, server in future_to_server.items():
+            if future in recorded:
+                continue
+            # Finished after the budget ran out but before this check
+            if future.done():
+                record(future, server)
+            else:
+                # A running check cannot be cancelled; closing its connection
+                # makes the pending command fail so the worker is freed
+                future.cancel()
+                close_active_connections(server['ip'], server['username'])
+                print(f"Health check timed out for {server['ip']}")
+
+    for hostname in find_threshold_violations(reports):
+        print(f"Resource usage over threshold on {hostname}")
+
+    if pq is not None and reports:
+        save_reports_parquet(reports)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,7 +1,6 @@
 import subprocess
 import psutil
 import os
-import re
 import json
 import socket
 import platform
@@ -9,9 +8,114 @@ from datetime import datetime
 import argparse
 import logging
 import yaml
-import threading
 import queue
 import time
+import threading
+import concurrent.futures
+import heapq
+import functools
+from operator import itemgetter
+
+# orjson is optional; it serializes metrics much faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# libyaml's C loader and dumper are much faster than the pure-Python ones when available
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Bytes per gigabyte, for reporting memory and disk sizes
+_GB = 1 << 30
+
+# Seconds to wait for partition usage before reporting a mount as timed out
+DISK_USAGE_TIMEOUT = 2
+
+# Seconds over which per-core and per-process CPU usage are measured
+CPU_SAMPLE_INTERVAL = 1
+
+# Kept open for the collector's lifetime and re-read in place each cycle
+MEMINFO_PATH = '/proc/meminfo'
+
+def _core_usage(start, end):
+    """
+    Per-core CPU utilisation between two readings of psutil.cpu_times(percpu=True)
+    
+    Computed here rather than with psutil.cpu_percent, whose baseline is
+    kept per calling thread while collectors run on pool threads.
+    
+    :param start: Per-core CPU times at the start of the window
+    :param end: Per-core CPU times at the end of the window
+    :return: List of busy percentages, one per core
+    """
+    usage = []
+    for before, after in zip(start, end):
+        # Guest time is already counted in user time on Linux
+        total = sum(after) - sum(before) - (
+            getattr(after, 'guest', 0) + getattr(after, 'guest_nice', 0)
+            - getattr(before, 'guest', 0) - getattr(before, 'guest_nice', 0)
+        )
+        idle = (after.idle + getattr(after, 'iowait', 0)) - (before.idle + getattr(before, 'iowait', 0))
+        usage.append(round(min(100.0, max(0.0, (total - idle) / total * 100)), 1) if total > 0 else 0.0)
+    return usage
+
+def _run_in_daemon_thread(function, *args):
+    """
+    Run a call on its own daemon thread
+    
+    Unlike pool threads, a call that never returns (such as statvfs on a
+    hung mount) is abandoned without holding up interpreter exit.
+    
+    :param function: Callable to run
+    :param args: Positional arguments for the callable
+    :return: Future resolved with the call's result or exception
+    """
+    future = concurrent.futures.Future()
+    future.set_running_or_notify_cancel()
+
+    def run():
+        try:
+            future.set_result(function(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+def _get_logger(log_level):
+    """
+    Get the collector logger, attaching its handlers only once
+    
+    Constructing several collectors in one process reuses the same
+    handlers instead of opening another log file each time.
+    
+    :param log_level: Logging level
+    :return: Logger writing to system_metrics.log and the console
+    """
+    logger = logging.getLogger('sysmetrics')
+    if not logger.handlers:
+        logger.propagate = False
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        for handler in (logging.FileHandler('system_metrics.log'), logging.StreamHandler()):
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+    logger.setLevel(log_level)
+    return logger
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_file(config_file, mtime_ns):
+    """
+    Parse a YAML configuration file, cached per path and modification time
+    
+    :param config_file: Path to configuration file
+    :param mtime_ns: Modification time of the file, so edits miss the cache
+    :return: Parsed configuration
+    """
+    with open(config_file, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
 
 class SystemMetricsCollector:
     def __init__(self, config_file=None, log_level=logging.INFO):
@@ -22,19 +126,11 @@ class SystemMetricsCollector:
         :param log_level: Logging level
         """
         # Configure logging
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('system_metrics.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        self.logger = _get_logger(log_level)
 
-        # Initialize metrics dictionary
+        # Initialize metrics dictionary; the timestamp is set at collection time
         self.metrics = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': None,
             'system': {},
             'hardware': {},
             'network': {},
@@ -45,6 +141,93 @@ class SystemMetricsCollector:
         # Load configuration
         self.config = self._load_config(config_file)
 
+        # Collectors run on a pool kept for the collector's lifetime
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=5)
+
+        # Static host details, read once instead of on every collection
+        self._cpu_phys = psutil.cpu_count(logical=False)
+        self._cpu_logical = psutil.cpu_count(logical=True)
+        self._os_info = {
+            'name': platform.system(),
+            'release': platform.release(),
+            'version': platform.version(),
+            'machine': platform.machine(),
+        }
+
+        # Open a CPU sampling window so collectors run on their own still
+        # measure usage; collect_all_metrics restarts it on every collection
+        self._start_cpu_sample()
+
+        # Disk usage probes by mountpoint; a probe still stuck on a hung
+        # mount is waited on again rather than started a second time
+        self._disk_probes = {}
+
+        # Memory is read through one open descriptor where /proc is available
+        try:
+            self._meminfo_fd = os.open(MEMINFO_PATH, os.O_RDONLY)
+        except OSError:
+            self._meminfo_fd = None
+
+    def close(self):
+        """
+        Release the worker pool and the open /proc/meminfo descriptor
+        """
+        self._executor.shutdown(wait=False)
+        if self._meminfo_fd is not None:
+            os.close(self._meminfo_fd)
+            self._meminfo_fd = None
+
+    def _start_cpu_sample(self):
+        """
+        Start a CPU sampling window
+        
+        Per-core and per-process CPU usage are deltas between two readings;
+        this takes the first reading of both, and collectors call
+        _wait_cpu_sample before taking the second.
+        """
+        self._cpu_times_start = psutil.cpu_times(percpu=True)
+        for _ in psutil.process_iter(['cpu_percent']):
+            pass
+        self._cpu_sample_end = time.monotonic() + CPU_SAMPLE_INTERVAL
+
+    def _wait_cpu_sample(self):
+        """
+        Block until the current CPU sampling window has elapsed
+        """
+        remaining = self._cpu_sample_end - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _memory_usage(self):
+        """
+        Read memory usage in bytes
+        
+        Re-reads /proc/meminfo through the descriptor opened at startup,
+        with the same semantics as psutil; other platforms use psutil.
+        
+        :return: Tuple of (total, available, used, percent)
+        """
+        if self._meminfo_fd is None:
+            mem = psutil.virtual_memory()
+            return mem.total, mem.available, mem.used, mem.percent
+
+        fields = {}
+        for line in os.pread(self._meminfo_fd, 4096, 0).splitlines():
+            name, _, value = line.partition(b':')
+            value = value.split()
+            # The fixed-size read may cut the last, unused line short
+            if value:
+                fields[name] = int(value[0]) * 1024
+
+        total = fields[b'MemTotal']
+        # Kernels before 3.14 lack MemAvailable; approximate it as psutil does
+        available = fields.get(b'MemAvailable')
+        if available is None:
+            available = fields[b'MemFree'] + fields.get(b'Buffers', 0) + fields.get(b'Cached', 0)
+        used = total - available
+        percent = round(used / total * 100, 1) if total else 0.0
+        return total, available, used, percent
+
     def _load_config(self, config_file):
         """
         Load configuration from YAML file
@@ -68,37 +251,36 @@ class SystemMetricsCollector:
 
         if config_file and os.path.exists(config_file):
             try:
-                with open(config_file, 'r') as f:
-                    user_config = yaml.safe_load(f)
-                    # Merge default config with user config
-                    default_config.update(user_config)
+                user_config = _parse_config_file(config_file, os.stat(config_file).st_mtime_ns)
+                # Merge default config with user config
+                default_config.update(user_config)
             except Exception as e:
                 self.logger.warning(f"Error loading config file: {e}. Using default config.")
         
         return default_config
 
-    def _run_command(self, command, shell=True):
+    def _run_command(self, command):
         """
-        Run a shell command with error handling
+        Run a command with error handling
+        
+        The command is executed directly, without an intermediate shell.
         
-        :param command: Command to run
-        :param shell: Use shell execution
+        :param command: Command and its arguments as a list
         :return: Command output
         """
         try:
             result = subprocess.run(
                 command, 
-                shell=shell, 
                 capture_output=True, 
                 text=True, 
                 timeout=10
             )
             return result.stdout.strip() if result.stdout else result.stderr.strip()
         except subprocess.TimeoutExpired:
-            self.logger.error(f"Command timed out: {command}")
+            self.logger.error(f"Command timed out: {' '.join(command)}")
             return None
         except Exception as e:
-            self.logger.error(f"Error running command {command}: {e}")
+            self.logger.error(f"Error running command {' '.join(command)}: {e}")
             return None
 
     def collect_system_info(self):
@@ -110,14 +292,9 @@ class SystemMetricsCollector:
 
         try:
             self.metrics['system'] = {
-                'os': {
-                    'name': platform.system(),
-                    'release': platform.release(),
-                    'version': platform.version(),
-                    'machine': platform.machine(),
-                },
+                'os': dict(self._os_info),
                 'hostname': socket.gethostname(),
-                'uptime': self._run_command('uptime -p'),
+                'uptime': self._run_command(['uptime', '-p']),
                 'boot_time': datetime.fromtimestamp(psutil.boot_time()).isoformat()
             }
         except Exception as e:
@@ -132,47 +309,93 @@ class SystemMetricsCollector:
 
         try:
             # Memory metrics
-            mem = psutil.virtual_memory()
+            total, available, used, percent = self._memory_usage()
             self.metrics['hardware']['memory'] = {
-                'total': mem.total / (1024 * 1024 * 1024),  # GB
-                'available': mem.available / (1024 * 1024 * 1024),
-                'used': mem.used / (1024 * 1024 * 1024),
-                'percent': mem.percent
+                'total': total / _GB,
+                'available': available / _GB,
+                'used': used / _GB,
+                'percent': percent
             }
 
             # CPU metrics
             cpu_freq = psutil.cpu_freq()
             self.metrics['hardware']['cpu'] = {
-                'physical_cores': psutil.cpu_count(logical=False),
-                'total_cores': psutil.cpu_count(logical=True),
+                'physical_cores': self._cpu_phys,
+                'total_cores': self._cpu_logical,
                 'current_frequency': cpu_freq.current,
                 'min_frequency': cpu_freq.min,
-                'max_frequency': cpu_freq.max,
-                'usage_per_core': psutil.cpu_percent(interval=1, percpu=True)
+                'max_frequency': cpu_freq.max
             }
 
-            # Disk metrics
+            # Disk metrics; mounts are queried in parallel so one hung mount
+            # (e.g. a stale NFS share) cannot stall the whole collection
             disk_partitions = psutil.disk_partitions()
             self.metrics['hardware']['disk'] = []
-            for partition in disk_partitions:
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    disk_info = {
-                        'device': partition.device,
-                        'mountpoint': partition.mountpoint,
-                        'fstype': partition.fstype,
-                        'total_size': usage.total / (1024 * 1024 * 1024),
-                        'used': usage.used / (1024 * 1024 * 1024),
-                        'free': usage.free / (1024 * 1024 * 1024),
-                        'percent': usage.percent
-                    }
-                    self.metrics['hardware']['disk'].append(disk_info)
-                except Exception as e:
-                    self.logger.warning(f"Error getting disk usage for {partition.mountpoint}: {e}")
+            if disk_partitions:
+                futures = [self._probe_partition(partition) for partition in disk_partitions]
+                concurrent.futures.wait(futures, timeout=DISK_USAGE_TIMEOUT)
+                for partition, future in zip(disk_partitions, futures):
+                    if not future.done():
+                        self.logger.warning(f"Timed out getting disk usage for {partition.mountpoint}")
+                        self.metrics['hardware']['disk'].append({
+                            'device': partition.device,
+                            'mountpoint': partition.mountpoint,
+                            'fstype': partition.fstype,
+                            'status': 'timeout'
+                        })
+                        continue
+                    try:
+                        self.metrics['hardware']['disk'].append(future.result())
+                    except Exception as e:
+                        self.logger.warning(f"Error getting disk usage for {partition.mountpoint}: {e}")
+
+            # Per-core usage over the sampling window, read once it has elapsed
+            self._wait_cpu_sample()
+            self.metrics['hardware']['cpu']['usage_per_core'] = _core_usage(
+                self._cpu_times_start, psutil.cpu_times(percpu=True)
+            )
 
         except Exception as e:
             self.logger.error(f"Error collecting hardware metrics: {e}")
 
+    def _probe_partition(self, partition):
+        """
+        Start reading usage for a disk partition on a daemon thread
+        
+        If an earlier probe of the same mountpoint has not returned yet, that
+        probe is reused, so a hung mount holds at most one thread.
+        
+        :param partition: Partition as returned by psutil.disk_partitions
+        :return: Future resolved with the partition usage dictionary
+        """
+        future = self._disk_probes.get(partition.mountpoint)
+        if future is None or future.done():
+            future = _run_in_daemon_thread(self._partition_usage, partition)
+            self._disk_probes[partition.mountpoint] = future
+        return future
+
+    def _partition_usage(self, partition):
+        """
+        Get usage figures for a single disk partition
+        
+        :param partition: Partition as returned by psutil.disk_partitions
+        :return: Dictionary of partition usage in GB and percent
+        """
+        # Same figures psutil.disk_usage reports, straight from statvfs
+        stats = os.statvfs(partition.mountpoint)
+        total = stats.f_blocks * stats.f_frsize
+        used = (stats.f_blocks - stats.f_bfree) * stats.f_frsize
+        free = stats.f_bavail * stats.f_frsize
+        return {
+            'device': partition.device,
+            'mountpoint': partition.mountpoint,
+            'fstype': partition.fstype,
+            'total_size': total / _GB,
+            'used': used / _GB,
+            'free': free / _GB,
+            'percent': round(used / (used + free) * 100, 1) if used + free else 0.0
+        }
+
     def collect_network_metrics(self):
         """
         Collect network-related metrics
@@ -193,23 +416,30 @@ class SystemMetricsCollector:
                     } for addr in addresses
                 ]
 
-            # Network connectivity checks
+            # Network connectivity checks, all pings in flight at once so the
+            # total wait is one ping rather than the sum of them
             network_hosts = self.config['advanced_checks']['network_ping_hosts']
             self.metrics['network']['connectivity'] = {}
-            for host in network_hosts:
-                try:
-                    response = subprocess.run(
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(network_hosts), 1)) as executor:
+                ping_futures = {
+                    host: executor.submit(
+                        subprocess.run,
                         ['ping', '-c', '4', host], 
                         capture_output=True, 
                         text=True, 
                         timeout=5
                     )
-                    self.metrics['network']['connectivity'][host] = (
-                        response.returncode == 0
-                    )
-                except Exception as e:
-                    self.logger.warning(f"Ping check failed for {host}: {e}")
-                    self.metrics['network']['connectivity'][host] = False
+                    for host in network_hosts
+                }
+                for host, future in ping_futures.items():
+                    try:
+                        response = future.result()
+                        self.metrics['network']['connectivity'][host] = (
+                            response.returncode == 0
+                        )
+                    except Exception as e:
+                        self.logger.warning(f"Ping check failed for {host}: {e}")
+                        self.metrics['network']['connectivity'][host] = False
 
         except Exception as e:
             self.logger.error(f"Error collecting network metrics: {e}")
@@ -221,15 +451,31 @@ class SystemMetricsCollector:
         if not self.config['collectors']['services']:
             return
 
+        services = []
         try:
             services = self.config['advanced_checks']['services_to_monitor']
             self.metrics['services'] = {}
-            
-            for service in services:
-                status = self._run_command(f'systemctl is-active {service}')
-                self.metrics['services'][service] = status
+            if not services:
+                return
+
+            # One systemctl call prints a status line per unit, in order
+            result = subprocess.run(
+                ['systemctl', 'is-active', *services], 
+                capture_output=True, 
+                text=True, 
+                timeout=10
+            )
+            statuses = result.stdout.splitlines()
+            if len(statuses) != len(services):
+                # systemctl failed outright (no systemd, bus error, bad unit
+                # name); report its error for any services left without a status
+                error = result.stderr.strip() or 'unknown'
+                self.logger.error(f"Error checking services {', '.join(services)}: {error}")
+                statuses += [error] * (len(services) - len(statuses))
+            self.metrics['services'] = dict(zip(services, statuses))
         except Exception as e:
             self.logger.error(f"Error collecting service status: {e}")
+            self.metrics['services'] = dict.fromkeys(services, 'unknown')
 
     def collect_performance_metrics(self):
         """
@@ -247,22 +493,32 @@ class SystemMetricsCollector:
                 '15_min': load_avg[2]
             }
 
-            # Process information
-            self.metrics['performance']['processes'] = {
-                'total': len(psutil.pids()),
-                'running': len([p for p in psutil.process_iter() if p.status() == psutil.STATUS_RUNNING]),
-                'top_cpu_consumers': []
-            }
+            # Per-process CPU usage is measured over the sampling window
+            # started with the collection; the wait overlaps the other collectors
+            self._wait_cpu_sample()
+
+            # Process information, gathered in a single pass over the process table
+            total = 0
+            running = 0
+            cpu_usage = []
+            for proc in psutil.process_iter(['pid', 'name', 'status', 'cpu_percent']):
+                total += 1
+                if proc.info['status'] == psutil.STATUS_RUNNING:
+                    running += 1
+                cpu_usage.append((proc.info['cpu_percent'] or 0.0, proc.info['pid'], proc.info['name']))
 
             # Top CPU consuming processes
-            for proc in sorted(psutil.process_iter(['pid', 'name', 'cpu_percent']), 
-                               key=lambda x: x.info['cpu_percent'], 
-                               reverse=True)[:5]:
-                self.metrics['performance']['processes']['top_cpu_consumers'].append({
-                    'pid': proc.info['pid'],
-                    'name': proc.info['name'],
-                    'cpu_percent': proc.info['cpu_percent']
-                })
+            self.metrics['performance']['processes'] = {
+                'total': total,
+                'running': running,
+                'top_cpu_consumers': [
+                    {
+                        'pid': pid,
+                        'name': name,
+                        'cpu_percent': cpu_percent
+                    } for cpu_percent, pid, name in heapq.nlargest(5, cpu_usage, key=itemgetter(0))
+                ]
+            }
 
         except Exception as e:
             self.logger.error(f"Error collecting performance metrics: {e}")
@@ -271,24 +527,20 @@ class SystemMetricsCollector:
         """
         Collect all system metrics based on configuration
         """
+        # Slowest, IO-bound collectors first so their waits overlap the rest
         metric_collectors = [
-            self.collect_system_info,
             self.collect_hardware_metrics,
+            self.collect_performance_metrics,
             self.collect_network_metrics,
             self.collect_service_status,
-            self.collect_performance_metrics
+            self.collect_system_info
         ]
 
-        # Use threading to potentially speed up collection
-        threads = []
-        for collector in metric_collectors:
-            thread = threading.Thread(target=collector)
-            thread.start()
-            threads.append(thread)
+        self.metrics['timestamp'] = datetime.now().isoformat()
+        self._start_cpu_sample()
 
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        # Run the collectors concurrently and wait for all of them
+        list(self._executor.map(lambda collector: collector(), metric_collectors))
 
         return self.metrics
 
@@ -303,12 +555,16 @@ class SystemMetricsCollector:
             
             if output_format.lower() == 'json':
                 filename = f"system_metrics_{timestamp}.json"
-                with open(filename, 'w') as f:
-                    json.dump(self.metrics, f, indent=4)
+                if orjson is not None:
+                    with open(filename, 'wb') as f:
+                        f.write(orjson.dumps(self.metrics, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(filename, 'w') as f:
+                        json.dump(self.metrics, f, indent=4)
             elif output_format.lower() == 'yaml':
                 filename = f"system_metrics_{timestamp}.yaml"
                 with open(filename, 'w') as f:
-                    yaml.dump(self.metrics, f, default_flow_style=False)
+                    yaml.dump(self.metrics, f, Dumper=SafeDumper, default_flow_style=False)
             
             self.logger.info(f"Metrics saved to {filename}")
             return filename
@@ -342,10 +598,16 @@ def main():
     )
     
     # Collect metrics
-    metrics = collector.collect_all_metrics()
+    try:
+        metrics = collector.collect_all_metrics()
+    finally:
+        collector.close()
     
     # Print metrics to console
-    print(json.dumps(metrics, indent=2))
+    if orjson is not None:
+        print(orjson.dumps(metrics, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(metrics, indent=2))
     
     # Save metrics to file
     collector.save_metrics(output_format=args.format)
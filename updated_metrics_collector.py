@@ -1,20 +1,134 @@
 import subprocess
 import os
 import csv
+import asyncio
 import concurrent.futures
+import json
 import paramiko
-import pandas as pd
 import logging
+import threading
 from datetime import datetime
 
+# orjson is optional; it parses sadf's JSON much faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# asyncssh is optional; with it every server is collected concurrently on one
+# event loop and servers still running at the collection timeout are cancelled
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
+# Delimiter echoed between batched remote commands
+SECTION_SEPARATOR = '---SEP---'
+
+# Seconds allowed for the TCP connect, SSH banner and authentication each
+CONNECT_TIMEOUT = 10
+
+# Seconds the batched remote command may stay silent before it is abandoned
+COMMAND_TIMEOUT = 60
+
+# Seconds a whole collection may take before unfinished servers are given up on
+COLLECTION_TIMEOUT = 180
+
+# Output columns, in the order fields are written per row
+OUTPUT_FIELDS = [
+    'timestamp', 'ip', 'hostname',
+    'memory_usage', 'cpu_usage', 'disk_usage',
+    'load_average', 'cpu_min', 'cpu_max', 'cpu_average',
+    'base_frequency', 'lowest_frequency', 'highest_frequency',
+    'cpu_vendor', 'time_sync_status', 'docker_status',
+    'connection_status'
+]
+
+# Rows are formatted directly; fields are sanitized so none need CSV quoting
+_ROW_FMT = ','.join(['{}'] * len(OUTPUT_FIELDS)) + '\n'
+_CSV_UNSAFE = str.maketrans({',': ';', '"': "'", '\n': ' ', '\r': ' '})
+
+# Host keys servers must match; unknown hosts are rejected, not added
+DEFAULT_KNOWN_HOSTS = os.path.expanduser('~/.ssh/known_hosts')
+
+# Commands run on every server, in the order their output is parsed
+REMOTE_COMMANDS = [
+    # Hostname
+    'hostname',
+    # Memory Usage
+    "free -m | grep Mem | awk '{ printf(\"%.2f\", (($3/$2)) * 100) }'",
+    # CPU Usage
+    "top -bn1 | grep 'Cpu(s)' | awk '{print 100 - $8\"%\"}'",
+    # Disk Usage
+    "df -h / | awk 'NR==2 {print $5}'",
+    # Load Average (parsed locally)
+    "cat /proc/loadavg",
+    # CPU Min/Max/Average over the last 24 hours (SAR, as JSON):
+    # yesterday's samples from this time of day, then today's
+    "sadf -j -s $(date +%T) /var/log/sa/sa$(date -d 'yesterday' +%d) -- -u",
+    "sadf -j /var/log/sa/sa$(date -d 'today' +%d) -- -u",
+    # CPU Frequency
+    "sudo dmidecode -t processor | grep -i 'Current Speed' | head -n1 | awk '{print $3 $4}' | tr -d 'MHz'",
+    # Core Frequencies and CPU Vendor (parsed locally)
+    "cat /proc/cpuinfo",
+    # Time Synchronization Status
+    "timedatectl | grep -i synchronized | awk -F ':' '{print $2}'",
+    # Docker Daemon Status
+    "systemctl is-active docker"
+]
+
+# Every metric is collected in a single remote exec; each command's output
+# is delimited so it can be split back apart locally
+_BATCH_COMMAND = f" ; echo '{SECTION_SEPARATOR}' ; ".join(REMOTE_COMMANDS)
+
+def _parse_cpuinfo(text):
+    """
+    Extract core frequencies and the CPU vendor from /proc/cpuinfo
+    
+    :param text: Contents of /proc/cpuinfo
+    :return: Tuple of (sorted whole-MHz core frequencies, vendor or None)
+    """
+    frequencies = []
+    vendor = None
+    for line in text.splitlines():
+        key, _, value = line.partition(':')
+        key = key.strip()
+        if key == 'cpu MHz':
+            frequencies.append(int(float(value)))
+        elif key == 'vendor_id' and vendor is None:
+            vendor = value.strip()
+    frequencies.sort()
+    return frequencies, vendor
+
+def _parse_sadf_cpu(text):
+    """
+    Extract busy CPU percentages from 'sadf -j -- -u' output
+    
+    :param text: JSON document printed by sadf
+    :return: List of 100 - %idle for every sample, all CPUs combined
+    """
+    if not text:
+        return []
+    document = orjson.loads(text) if orjson is not None else json.loads(text)
+    busy = []
+    for host in document['sysstat']['hosts']:
+        for sample in host.get('statistics', []):
+            # Newer sysstat names the section 'cpu-load', older 'cpu-load-all'
+            for cpu in sample.get('cpu-load') or sample.get('cpu-load-all') or []:
+                if cpu.get('cpu') == 'all':
+                    busy.append(100 - cpu['idle'])
+    return busy
+
 class MultiServerMetricsCollector:
-    def __init__(self, credentials_file, output_file='multi_server_metrics.csv', log_file='multi_server_metrics.log'):
+    def __init__(self, credentials_file, output_file='multi_server_metrics.csv', log_file='multi_server_metrics.log',
+                 known_hosts_file=DEFAULT_KNOWN_HOSTS):
         """
         Initialize multi-server metrics collector
         
         :param credentials_file: CSV file with server credentials
         :param output_file: Output CSV file for metrics
         :param log_file: Logging file
+        :param known_hosts_file: OpenSSH known_hosts file servers are verified against
         """
         # Configure logging
         logging.basicConfig(
@@ -27,13 +141,37 @@ class MultiServerMetricsCollector:
         
         # Load server credentials
         try:
-            self.servers = pd.read_csv(credentials_file)
+            with open(credentials_file, newline='') as f:
+                self.servers = list(csv.DictReader(f))
         except Exception as e:
             self.logger.error(f"Error reading credentials file: {e}")
             raise
 
-        # Output file
+        # Known host keys, parsed once and shared by every new connection
+        self._host_keys = paramiko.HostKeys()
+        try:
+            self._host_keys.load(known_hosts_file)
+        except IOError:
+            self.logger.warning(f"Known hosts file {known_hosts_file} not found; connections will be rejected")
+
+        # SSH connections cached per (ip, username), reused across collections
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+
+        # With asyncssh, collections run on one event loop kept for the
+        # collector's lifetime so its connections can be reused as well
+        self._loop = None
+        if asyncssh is not None:
+            self._loop = asyncio.new_event_loop()
+            self._async_connections = {}
+            try:
+                self._async_known_hosts = asyncssh.read_known_hosts(known_hosts_file)
+            except OSError:
+                self._async_known_hosts = asyncssh.import_known_hosts('')
+
+        # Output file, written by one writer shared across worker results
         self.output_file = output_file
+        self._output_lock = threading.Lock()
         
         # Initialize output CSV
         self._initialize_output_csv()
@@ -41,6 +179,9 @@ class MultiServerMetricsCollector:
     def _initialize_output_csv(self):
         """
         Create output CSV with headers
+        
+        The file stays open for the collector's lifetime so each row is a
+        single buffered write; close() releases it.
         """
         try:
             headers = [
@@ -52,112 +193,145 @@ class MultiServerMetricsCollector:
                 'Connection_Status'
             ]
             
-            with open(self.output_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
+            self._fh = open(self.output_file, 'w', newline='')
+            self._fh.write(_ROW_FMT.format(*headers))
+            self._fh.flush()
         except Exception as e:
             self.logger.error(f"Error initializing output CSV: {e}")
             raise
 
-    def collect_server_metrics(self, ip, username, password):
+    def _get_connection(self, ip, username, password):
+        """
+        Get a cached SSH connection to a server, connecting if needed
+        
+        :param ip: Server IP address
+        :param username: SSH username
+        :param password: SSH password
+        :return: Connected paramiko SSHClient
+        """
+        key = (ip, username)
+        with self._connections_lock:
+            ssh = self._connections.get(key)
+
+        if ssh is not None:
+            transport = ssh.get_transport()
+            if transport is not None and transport.is_active():
+                return ssh
+            ssh.close()
+
+        ssh = paramiko.SSHClient()
+        ssh.get_host_keys().update(self._host_keys)
+        ssh.set_missing_host_key_policy(paramiko.RejectPolicy())
+        ssh.connect(
+            ip,
+            username=username,
+            password=password,
+            timeout=CONNECT_TIMEOUT,
+            banner_timeout=CONNECT_TIMEOUT,
+            auth_timeout=CONNECT_TIMEOUT
+        )
+        # Keep idle connections from being dropped between collections
+        ssh.get_transport().set_keepalive(30)
+
+        with self._connections_lock:
+            self._connections[key] = ssh
+        return ssh
+
+    def _drop_connection(self, ip, username):
+        """
+        Close and forget the cached SSH connection to a server
+        
+        :param ip: Server IP address
+        :param username: SSH username
+        """
+        with self._connections_lock:
+            ssh = self._connections.pop((ip, username), None)
+        if ssh is not None:
+            ssh.close()
+
+    async def _get_async_connection(self, ip, username, password):
+        """
+        Get a cached asyncssh connection to a server, connecting if needed
+        
+        :param ip: Server IP address
+        :param username: SSH username
+        :param password: SSH password
+        :return: Connected asyncssh SSHClientConnection
+        """
+        key = (ip, username)
+        conn = self._async_connections.get(key)
+        if conn is not None and not conn.is_closed():
+            return conn
+
+        conn = await asyncssh.connect(
+            ip,
+            username=username,
+            password=password,
+            known_hosts=self._async_known_hosts,
+            connect_timeout=CONNECT_TIMEOUT,
+            login_timeout=CONNECT_TIMEOUT,
+            # Keep idle connections from being dropped between collections
+            keepalive_interval=30
+        )
+        self._async_connections[key] = conn
+        return conn
+
+    def close(self):
+        """
+        Close every cached SSH connection and the output CSV
+        """
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for ssh in connections:
+            ssh.close()
+
+        if self._loop is not None:
+            for conn in self._async_connections.values():
+                conn.close()
+                self._loop.run_until_complete(conn.wait_closed())
+            self._async_connections.clear()
+            self._loop.close()
+            self._loop = None
+
+        with self._output_lock:
+            self._fh.close()
+
+    def collect_server_metrics(self, ip, username, password, timestamp=None):
         """
         Collect metrics for a single server
         
         :param ip: Server IP address
         :param username: SSH username
         :param password: SSH password
+        :param timestamp: Collection cycle timestamp; defaults to now
         :return: Dictionary of metrics
         """
         metrics = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or datetime.now().isoformat(),
             'ip': ip,
             'connection_status': 'Failed'
         }
 
         try:
-            # Establish SSH connection
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(ip, username=username, password=password)
+            # Reuse the cached SSH connection, connecting on first use
+            ssh = self._get_connection(ip, username, password)
             metrics['connection_status'] = 'Success'
 
-            # Collect metrics via SSH commands
-            def run_ssh_command(command):
-                try:
-                    _, stdout, _ = ssh.exec_command(command)
-                    return stdout.read().decode('utf-8').strip()
-                except Exception as e:
-                    self.logger.warning(f"Command error on {ip}: {command} - {e}")
-                    return "ERROR"
-
-            # Hostname
-            metrics['hostname'] = run_ssh_command('hostname')
-
-            # Memory Usage
-            metrics['memory_usage'] = run_ssh_command(
-                "free -m | grep Mem | awk '{ printf(\"%.2f\", (($3/$2)) * 100) }'"
-            )
-
-            # CPU Usage
-            metrics['cpu_usage'] = run_ssh_command(
-                "top -bn1 | grep 'Cpu(s)' | awk '{print 100 - $8\"%\"}'"
-            )
-
-            # Disk Usage
-            metrics['disk_usage'] = run_ssh_command(
-                "df -h / | awk 'NR==2 {print $5}'"
-            )
-
-            # Load Average
-            metrics['load_average'] = run_ssh_command(
-                "cat /proc/loadavg | awk '{print $1}'"
-            )
-
-            # CPU Min/Max/Average (SAR)
-            sar_data = run_ssh_command(
-                "sar -f /var/log/sa/sa$(date -d 'yesterday' +%d) -s $(date +%T) | "
-                "awk '!/Average|%system|Linux|RESTART|^$/ {print 100-$9}' && "
-                "sar -f /var/log/sa/sa$(date -d 'today' +%d) | "
-                "awk '!/Average|%system|Linux|RESTART|^$/ {print 100-$9}' | "
-                "sort -nr"
-            ).split('\n')
-            
             try:
-                metrics['cpu_min'] = f"{sar_data[-1]}%"
-                metrics['cpu_max'] = f"{sar_data[0]}%"
-                metrics['cpu_average'] = f"{sum(float(x) for x in sar_data)/len(sar_data):.2f}%"
-            except Exception:
-                metrics['cpu_min'] = metrics['cpu_max'] = metrics['cpu_average'] = "ERROR"
-
-            # CPU Frequency
-            metrics['base_frequency'] = run_ssh_command(
-                "sudo dmidecode -t processor | grep -i 'Current Speed' | head -n1 | awk '{print $3 $4}' | tr -d 'MHz'"
-            )
-
-            # Lowest and Highest Core Frequencies
-            frequencies = run_ssh_command(
-                "cat /proc/cpuinfo | grep -i Mhz | awk -F ':' '{print $2}' | "
-                "awk -F '.' '{print $1}' | tr -d ' ' | sort -n"
-            ).split('\n')
-            metrics['lowest_frequency'] = frequencies[0] if frequencies else "ERROR"
-            metrics['highest_frequency'] = frequencies[-1] if frequencies else "ERROR"
-
-            # CPU Vendor
-            metrics['cpu_vendor'] = run_ssh_command(
-                "cat /proc/cpuinfo | grep -i vendor | head -1 | awk '{print $3}'"
-            )
-
-            # Time Synchronization Status
-            metrics['time_sync_status'] = run_ssh_command(
-                "timedatectl | grep -i synchronized | awk -F ':' '{print $2}'"
-            )
-
-            # Docker Daemon Status
-            metrics['docker_status'] = run_ssh_command(
-                "systemctl is-active docker"
-            )
+                try:
+                    _, stdout, _ = ssh.exec_command(_BATCH_COMMAND, timeout=COMMAND_TIMEOUT)
+                except (paramiko.SSHException, EOFError):
+                    # The cached connection died since its last use; reconnect once
+                    self._drop_connection(ip, username)
+                    ssh = self._get_connection(ip, username, password)
+                    _, stdout, _ = ssh.exec_command(_BATCH_COMMAND, timeout=COMMAND_TIMEOUT)
+                output = stdout.read().decode('utf-8')
+            except Exception as e:
+                self.logger.warning(f"Command error on {ip}: {e}")
+                output = ''
+            self._parse_output(ip, output, metrics)
 
-            ssh.close()
             return metrics
 
         except paramiko.AuthenticationException:
@@ -168,32 +342,188 @@ class MultiServerMetricsCollector:
         
         return metrics
 
-    def collect_all_metrics(self, max_workers=5):
+    async def _collect_server_metrics_async(self, ip, username, password, timestamp):
+        """
+        Collect metrics for a single server over asyncssh
+        
+        :param ip: Server IP address
+        :param username: SSH username
+        :param password: SSH password
+        :param timestamp: Collection cycle timestamp
+        :return: Dictionary of metrics
+        """
+        metrics = {
+            'timestamp': timestamp,
+            'ip': ip,
+            'connection_status': 'Failed'
+        }
+
+        try:
+            # Reuse the cached SSH connection, connecting on first use
+            conn = await self._get_async_connection(ip, username, password)
+            metrics['connection_status'] = 'Success'
+
+            try:
+                try:
+                    result = await conn.run(_BATCH_COMMAND, timeout=COMMAND_TIMEOUT)
+                except (asyncssh.ChannelOpenError, asyncssh.ConnectionLost):
+                    # The cached connection died since its last use; reconnect once
+                    self._async_connections.pop((ip, username), None)
+                    conn = await self._get_async_connection(ip, username, password)
+                    result = await conn.run(_BATCH_COMMAND, timeout=COMMAND_TIMEOUT)
+                output = result.stdout
+            except (asyncssh.Error, OSError) as e:
+                self.logger.warning(f"Command error on {ip}: {e}")
+                output = ''
+            self._parse_output(ip, output, metrics)
+
+        except asyncssh.PermissionDenied:
+            metrics['connection_status'] = 'Authentication Failed'
+            self.logger.error(f"Authentication failed for {ip}")
+        except Exception as e:
+            self.logger.error(f"Error collecting metrics for {ip}: {e}")
+
+        return metrics
+
+    async def _collect_all_metrics_async(self, timestamp, timeout):
+        """
+        Collect metrics for all servers concurrently on the event loop
+        
+        :param timestamp: Collection cycle timestamp
+        :param timeout: Seconds allowed for the whole collection
+        """
+        async def collect(row):
+            self._save_metrics(await self._collect_server_metrics_async(
+                row['ip'], row['username'], row['password'], timestamp
+            ))
+
+        tasks = {asyncio.ensure_future(collect(row)): row['ip'] for row in self.servers}
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+
+        # Cancellation interrupts a server wherever it is waiting on the network
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        for task in pending:
+            if task.cancelled():
+                self.logger.error(f"Metrics collection timed out for {tasks[task]}")
+                self._save_metrics({
+                    'timestamp': timestamp,
+                    'ip': tasks[task],
+                    'connection_status': 'Timeout'
+                })
+
+    def collect_all_metrics(self, max_workers=5, timeout=COLLECTION_TIMEOUT):
         """
         Collect metrics for all servers
         
-        :param max_workers: Maximum parallel connections
+        With asyncssh installed every server is collected at once on the
+        event loop; otherwise a thread pool is used. Servers still unfinished
+        after the timeout are recorded with a 'Timeout' connection status.
+        
+        :param max_workers: Maximum parallel connections when using threads
+        :param timeout: Seconds allowed for the whole collection
         """
+        # Every server in a cycle is reported under the same timestamp
+        timestamp = datetime.now().isoformat()
+
+        if self._loop is not None:
+            self._loop.run_until_complete(self._collect_all_metrics_async(timestamp, timeout))
+            return
+
         # Use ThreadPoolExecutor for parallel processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
             # Prepare futures
             futures = {
                 executor.submit(
                     self.collect_server_metrics, 
                     row['ip'], 
                     row['username'], 
-                    row['password']
-                ): row['ip'] for _, row in self.servers.iterrows()
+                    row['password'],
+                    timestamp
+                ): row for row in self.servers
             }
 
             # Collect and save results
-            for future in concurrent.futures.as_completed(futures):
-                server_ip = futures[future]
-                try:
-                    metrics = future.result()
-                    self._save_metrics(metrics)
-                except Exception as e:
-                    self.logger.error(f"Error processing {server_ip}: {e}")
+            saved = set()
+            try:
+                for future in concurrent.futures.as_completed(futures, timeout=timeout):
+                    saved.add(future)
+                    self._save_future_metrics(future, futures[future]['ip'])
+            except concurrent.futures.TimeoutError:
+                for future, row in futures.items():
+                    if future in saved:
+                        continue
+                    # Finished after the timeout fired but before this check
+                    if future.done():
+                        self._save_future_metrics(future, row['ip'])
+                        continue
+                    # Threads cannot be interrupted; closing the server's
+                    # connection makes a pending command fail promptly
+                    future.cancel()
+                    self._drop_connection(row['ip'], row['username'])
+                    self.logger.error(f"Metrics collection timed out for {row['ip']}")
+                    self._save_metrics({
+                        'timestamp': timestamp,
+                        'ip': row['ip'],
+                        'connection_status': 'Timeout'
+                    })
+        finally:
+            # Don't wait here; connect and command timeouts bound the threads
+            executor.shutdown(wait=False)
+
+    def _save_future_metrics(self, future, server_ip):
+        """
+        Save the metrics returned by a finished collection future
+        
+        :param future: Completed future from collect_server_metrics
+        :param server_ip: Server the future collected
+        """
+        try:
+            self._save_metrics(future.result())
+        except Exception as e:
+            self.logger.error(f"Error processing {server_ip}: {e}")
+
+    def _parse_output(self, ip, output, metrics):
+        """
+        Fill in metrics from the output of the batched remote command
+        
+        :param ip: Server IP address, for logging
+        :param output: Decoded stdout of the batched command
+        :param metrics: Dictionary of metrics to update
+        """
+        sections = [section.strip() for section in output.split(f'{SECTION_SEPARATOR}\n')]
+        if len(sections) != len(REMOTE_COMMANDS):
+            self.logger.warning(f"Unexpected command output from {ip}")
+            sections = ["ERROR"] * len(REMOTE_COMMANDS)
+
+        (metrics['hostname'], metrics['memory_usage'], metrics['cpu_usage'],
+         metrics['disk_usage'], loadavg_output, sar_yesterday, sar_today,
+         metrics['base_frequency'], cpuinfo_output,
+         metrics['time_sync_status'], metrics['docker_status']) = sections
+
+        load_fields = loadavg_output.split()
+        metrics['load_average'] = load_fields[0] if load_fields else "ERROR"
+
+        try:
+            sar_data = _parse_sadf_cpu(sar_yesterday) + _parse_sadf_cpu(sar_today)
+            metrics['cpu_min'] = f"{min(sar_data):.2f}%"
+            metrics['cpu_max'] = f"{max(sar_data):.2f}%"
+            metrics['cpu_average'] = f"{sum(sar_data)/len(sar_data):.2f}%"
+        except Exception:
+            metrics['cpu_min'] = metrics['cpu_max'] = metrics['cpu_average'] = "ERROR"
+
+        try:
+            frequencies, vendor = _parse_cpuinfo(cpuinfo_output)
+        except ValueError:
+            frequencies, vendor = [], None
+        metrics['lowest_frequency'] = frequencies[0] if frequencies else "ERROR"
+        metrics['highest_frequency'] = frequencies[-1] if frequencies else "ERROR"
+        metrics['cpu_vendor'] = vendor or "ERROR"
 
     def _save_metrics(self, metrics):
         """
@@ -202,27 +532,13 @@ class MultiServerMetricsCollector:
         :param metrics: Dictionary of metrics for a server
         """
         try:
-            with open(self.output_file, 'a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    metrics.get('timestamp', ''),
-                    metrics.get('ip', ''),
-                    metrics.get('hostname', ''),
-                    metrics.get('memory_usage', ''),
-                    metrics.get('cpu_usage', ''),
-                    metrics.get('disk_usage', ''),
-                    metrics.get('load_average', ''),
-                    metrics.get('cpu_min', ''),
-                    metrics.get('cpu_max', ''),
-                    metrics.get('cpu_average', ''),
-                    metrics.get('base_frequency', ''),
-                    metrics.get('lowest_frequency', ''),
-                    metrics.get('highest_frequency', ''),
-                    metrics.get('cpu_vendor', ''),
-                    metrics.get('time_sync_status', ''),
-                    metrics.get('docker_status', ''),
-                    metrics.get('connection_status', '')
-                ])
+            row = _ROW_FMT.format(*(
+                str(metrics.get(field, '')).translate(_CSV_UNSAFE)
+                for field in OUTPUT_FIELDS
+            ))
+            with self._output_lock:
+                self._fh.write(row)
+                self._fh.flush()
             self.logger.info(f"Metrics logged for {metrics.get('ip', 'Unknown IP')}")
         except Exception as e:
             self.logger.error(f"Error saving metrics: {e}")
@@ -236,7 +552,10 @@ def main():
         collector = MultiServerMetricsCollector(credentials_file)
         
         # Collect metrics for all servers
-        collector.collect_all_metrics()
+        try:
+            collector.collect_all_metrics()
+        finally:
+            collector.close()
         
         print(f"Metrics collection complete. Check {collector.output_file} for results.")
     